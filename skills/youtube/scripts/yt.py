@@ -16,31 +16,70 @@ Usage:
 
   yt.py playlists list   [--format table|json]
   yt.py playlists create <TITLE> [--description D] [--privacy public|private|unlisted]
-  yt.py playlists items  <PLAYLIST_ID> [--format table|json]
+  yt.py playlists items  <PLAYLIST_ID> [--format table|json] [--fresh]
   yt.py playlists add    <PLAYLIST_ID> <VIDEO_ID>
   yt.py playlists remove <PLAYLIST_ID> <VIDEO_ID>
   yt.py playlists delete <PLAYLIST_ID> [--yes]
 
   yt.py comments list  <VIDEO_ID> [--limit N] [--order relevance|time] [--format table|json]
+                               [--fresh]
   yt.py comments reply <COMMENT_ID> <TEXT>
 
   yt.py search <QUERY> [--limit N] [--type video|playlist|channel] [--format table|json]
+               [--fresh]
 
-  yt.py export      [--format csv|json]
+  yt.py export      [--format csv|json|jsonl]
   yt.py bulk-update <CSV_FILE>
+
+  yt.py cache clear                               Delete cached API responses
 """
 
 import argparse
+import atexit
+import contextlib
 import csv
+import datetime
+import functools
+import hashlib
+import itertools
 import json
+import mimetypes
+import os
+import random
+import shutil
 import sys
 import time
 from pathlib import Path
 
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
 # ── Credentials paths ──────────────────────────────────────────────────────────
 CREDENTIALS_DIR = Path.home() / ".youtube-skill"
 CREDENTIALS_FILE = CREDENTIALS_DIR / "credentials.json"
 CLIENT_SECRETS_FILE = CREDENTIALS_DIR / "client_secrets.json"
+CREDENTIALS_LOCK_FILE = CREDENTIALS_DIR / ".lock"
+CHANNEL_INFO_FILE = CREDENTIALS_DIR / "channel_info.json"
+CACHE_DIR = CREDENTIALS_DIR / "cache"
+QUOTA_FILE = CREDENTIALS_DIR / "quota.json"
+QUOTA_LOCK_FILE = QUOTA_FILE.with_suffix(".lock")
+
+# Channel ID and uploads playlist never change for a channel; re-check monthly
+CHANNEL_INFO_TTL = 30 * 24 * 3600
+
+# Read-only listings are served from CACHE_DIR for this long (seconds);
+# bypass with --fresh or YT_NO_CACHE=1
+SEARCH_TTL = 5 * 60
+COMMENTS_TTL = 5 * 60
+PLAYLIST_ITEMS_TTL = 60 * 60
+
+# ETag entries not read or written for this long are deleted on the next cache write
+CACHE_MAX_AGE = 7 * 24 * 3600
+
+# Top-level modules provided by the packages setup.sh installs
+_SETUP_PACKAGES = {"google", "googleapiclient", "google_auth_httplib2", "google_auth_oauthlib", "httplib2"}
 
 SCOPES = [
     "https://www.googleapis.com/auth/youtube",
@@ -49,29 +88,167 @@ SCOPES = [
     "https://www.googleapis.com/auth/yt-analytics.readonly",
 ]
 
+# Calls per batch HTTP request (the API accepts up to 1000; smaller batches
+# keep multipart bodies and server-side processing time reasonable)
+_BATCH_SIZE = 50
+
+# Calls failing with these statuses, or 403s with these reasons, are retried
+# with exponential backoff
+_TRANSIENT_STATUSES = {429, 500, 502, 503, 504}
+_RATE_LIMIT_REASONS = {"rateLimitExceeded", "userRateLimitExceeded"}
+_MAX_RETRIES = 5
+
+# Only these are safe to re-send: a retried POST can post a comment, create a
+# playlist entry or upload a video twice
+_IDEMPOTENT_METHODS = {"GET", "PUT", "DELETE"}
+
+# Quota units per API method; methods not listed (list calls) cost 1 unit
+_QUOTA_COSTS = {
+    "youtube.videos.insert": 1600,
+    "youtube.search.list": 100,
+    "youtube.videos.update": 50,
+    "youtube.videos.delete": 50,
+    "youtube.thumbnails.set": 50,
+    "youtube.playlists.insert": 50,
+    "youtube.playlists.delete": 50,
+    "youtube.playlistItems.insert": 50,
+    "youtube.playlistItems.delete": 50,
+    "youtube.comments.insert": 50,
+}
+
+# MIME types by extension; anything else falls back to mimetypes.guess_type
+_VIDEO_MIME = {
+    ".mp4": "video/mp4",
+    ".mov": "video/quicktime",
+    ".avi": "video/x-msvideo",
+    ".mkv": "video/x-matroska",
+    ".webm": "video/webm",
+    ".flv": "video/x-flv",
+    ".wmv": "video/x-ms-wmv",
+    ".m4v": "video/x-m4v",
+}
+_IMAGE_MIME = {".jpg": "image/jpeg", ".jpeg": "image/jpeg", ".png": "image/png"}
+
+# Uploads below _SIMPLE_UPLOAD_MAX use a single request; larger ones are
+# resumable, in chunks of at least _MIN_UPLOAD_CHUNK
+_SIMPLE_UPLOAD_MAX = 5 * 1024 * 1024
+_MIN_UPLOAD_CHUNK = 8 * 1024 * 1024
+_UPLOAD_CHUNK_UNIT = 256 * 1024
+
+# ── Output formats ─────────────────────────────────────────────────────────────
+# Shared read-only default for missing response sections (never mutated)
+_EMPTY = {}
+
+VIDEO_LIST_FIELDNAMES = ("id", "title", "published", "status", "views", "likes", "comments", "url")
+EXPORT_FIELDNAMES = (
+    "id", "title", "description", "tags", "category_id", "published_at",
+    "status", "duration", "views", "likes", "comments", "url",
+)
+
+# Table rows, pre-bound so each row is one method call; tables are written
+# to stdout in a single call rather than one print() per row
+VIDEO_ROW_FMT = "{id}  {status:9}  {views:>9} views  {published}  {title}\n".format
+PLAYLIST_ROW_FMT = "{id}  {status:9}  {count:4} videos  {title}\n".format
+PLAYLIST_ITEM_ROW_FMT = "{n:4}.  {id}  {title}\n".format
+COMMENT_ROW_FMT = "[{id}]  {published}  {author}  ({likes} likes, {replies} replies)\n  {text}\n\n".format
+SEARCH_ROW_FMT = "{id}  {published}  {title}\n".format
+
+# Partial-response masks: only the JSON paths each command actually reads.
+# (gzip is already negotiated by googleapiclient on every request.)
+FIELDS_UPLOADS = "items/contentDetails/videoId,nextPageToken"
+FIELDS_STATUS = "items(id,status/privacyStatus)"
+FIELDS_VIDEO_LIST = (
+    "items(id,snippet(title,publishedAt),status/privacyStatus,"
+    "statistics(viewCount,likeCount,commentCount))"
+)
+FIELDS_VIDEO_DETAIL = (
+    "items(id,snippet(title,description,tags,categoryId,publishedAt),"
+    "status(privacyStatus,publishAt),contentDetails/duration,"
+    "statistics(viewCount,likeCount,commentCount))"
+)
+FIELDS_PLAYLISTS = "items(id,snippet/title,status/privacyStatus,contentDetails/itemCount),nextPageToken"
+FIELDS_PLAYLIST_ITEMS = "items(snippet/title,contentDetails/videoId),nextPageToken"
+FIELDS_COMMENTS = (
+    "items(id,snippet(totalReplyCount,"
+    "topLevelComment/snippet(authorDisplayName,textDisplay,likeCount,publishedAt)))"
+)
+FIELDS_SEARCH = "items(id,snippet(title,publishedAt))"
+FIELDS_EXPORT = (
+    "etag,items(id,snippet(title,description,tags,categoryId,publishedAt),"
+    "status/privacyStatus,contentDetails/duration,"
+    "statistics(viewCount,likeCount,commentCount))"
+)
+
 # ── Auth ───────────────────────────────────────────────────────────────────────
 
 
-def _check_deps():
-    try:
-        import googleapiclient  # noqa: F401
-        import google.auth  # noqa: F401
-        import google_auth_oauthlib  # noqa: F401
-    except ImportError:
-        print("Missing dependencies. Run:  bash scripts/setup.sh", file=sys.stderr)
+def _atomic_write(path, text):
+    """Write text to path via a temp file + rename so readers never see a partial file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(text, encoding="utf-8")
+    os.replace(tmp, path)
+
+
+@contextlib.contextmanager
+def _file_lock(path):
+    """Hold an exclusive lock on path (no-op without fcntl)."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as f:
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        yield
+
+
+def _credentials_lock():
+    """Hold an exclusive lock on the credentials directory."""
+    return _file_lock(CREDENTIALS_LOCK_FILE)
+
+
+def _obtain_credentials(creds):
+    """Refresh expired credentials, or run the browser consent flow."""
+    if creds and creds.expired and creds.refresh_token:
+        from google.auth.transport.requests import Request
+
+        print("Refreshing credentials...", file=sys.stderr)
+        creds.refresh(Request())
+        return creds
+
+    if not CLIENT_SECRETS_FILE.exists():
+        print(
+            f"\nNo OAuth credentials found at:\n  {CLIENT_SECRETS_FILE}\n",
+            file=sys.stderr,
+        )
+        print(
+            "Run setup first:\n  bash scripts/setup.sh\n"
+            "or follow the manual steps in SKILL.md under 'Authentication'.",
+            file=sys.stderr,
+        )
         sys.exit(1)
 
+    from google_auth_oauthlib.flow import InstalledAppFlow
+
+    print("Opening browser for YouTube authorisation...", file=sys.stderr)
+    flow = InstalledAppFlow.from_client_secrets_file(
+        str(CLIENT_SECRETS_FILE), SCOPES
+    )
+    creds = flow.run_local_server(port=0, open_browser=True)
+    print("Authorisation successful.", file=sys.stderr)
+    # A new login may be a different account
+    CHANNEL_INFO_FILE.unlink(missing_ok=True)
+    return creds
+
 
+@functools.lru_cache(maxsize=None)
 def get_service():
     """Return an authenticated YouTube Data API v3 service object.
 
     On first call: opens a browser window for OAuth2 consent and caches the token.
     On subsequent calls: loads the cached token, refreshing silently if needed.
+    The service is built once per process and reused (tests, REPL sessions).
     """
-    _check_deps()
-    from google.auth.transport.requests import Request
+    # Imported lazily so --help and usage errors never pay for them
     from google.oauth2.credentials import Credentials
-    from google_auth_oauthlib.flow import InstalledAppFlow
     from googleapiclient.discovery import build
 
     creds = None
@@ -80,37 +257,222 @@ def get_service():
         creds = Credentials.from_authorized_user_file(str(CREDENTIALS_FILE), SCOPES)
 
     if not creds or not creds.valid:
-        if creds and creds.expired and creds.refresh_token:
-            print("Refreshing credentials...", file=sys.stderr)
-            creds.refresh(Request())
-        else:
-            if not CLIENT_SECRETS_FILE.exists():
-                print(
-                    f"\nNo OAuth credentials found at:\n  {CLIENT_SECRETS_FILE}\n",
-                    file=sys.stderr,
-                )
-                print(
-                    "Run setup first:\n  bash scripts/setup.sh\n"
-                    "or follow the manual steps in SKILL.md under 'Authentication'.",
-                    file=sys.stderr,
-                )
+        with _credentials_lock():
+            # Another yt.py process may have refreshed the token while we waited
+            if CREDENTIALS_FILE.exists():
+                creds = Credentials.from_authorized_user_file(str(CREDENTIALS_FILE), SCOPES)
+            if not creds or not creds.valid:
+                creds = _obtain_credentials(creds)
+                _atomic_write(CREDENTIALS_FILE, creds.to_json())
+
+    # static_discovery=True is already build()'s default here (the bundled
+    # document); it is spelled out for clarity. cache_discovery=False skips
+    # discovery_cache.autodetect() and its optional-backend import probing.
+    return build(
+        "youtube", "v3", credentials=creds, static_discovery=True, cache_discovery=False
+    )
+
+
+def _no_service(func):
+    """Mark a command that runs locally, so main() skips get_service() for it."""
+    func._no_service = True
+    return func
+
+
+# ── Quota budget ───────────────────────────────────────────────────────────────
+
+# Units spent today before this run (loaded on first charge) and by this run
+_quota_spent = None
+_quota_used = 0
+_quota_limit = None
+
+
+def _quota_day():
+    """Return today's date in Pacific Time, when the API's daily quota resets."""
+    try:
+        from zoneinfo import ZoneInfo
+
+        tz = ZoneInfo("America/Los_Angeles")
+    except Exception:  # Python 3.8, or no tz database (Windows without tzdata)
+        tz = datetime.timezone(datetime.timedelta(hours=-8))
+    return datetime.datetime.now(tz).date().isoformat()
+
+
+def _load_quota():
+    try:
+        entry = json.loads(QUOTA_FILE.read_text(encoding="utf-8"))
+        return entry["used"] if entry["date"] == _quota_day() else 0
+    except (OSError, ValueError, KeyError):
+        return 0
+
+
+def _save_quota():
+    # Re-read under the lock so concurrent runs add up rather than overwrite.
+    # Not the credentials lock: an 'auth' waiting on a browser login holds it.
+    with _file_lock(QUOTA_LOCK_FILE):
+        used = _load_quota() + _quota_used
+        _atomic_write(QUOTA_FILE, json.dumps({"date": _quota_day(), "used": used}))
+
+
+def _quota_allows(units):
+    """Return True if spending units keeps today's usage within YT_QUOTA_LIMIT."""
+    global _quota_spent, _quota_limit
+    if _quota_spent is None:
+        limit = os.environ.get("YT_QUOTA_LIMIT")
+        if limit:
+            try:
+                _quota_limit = int(limit)
+            except ValueError:
+                print(f"YT_QUOTA_LIMIT must be a whole number of units, not {limit!r}.", file=sys.stderr)
                 sys.exit(1)
+        _quota_spent = _load_quota()
+        atexit.register(_save_quota)
+    return _quota_limit is None or _quota_spent + _quota_used + units <= _quota_limit
+
+
+def _check_quota(units):
+    """Exit before spending units if that would pass YT_QUOTA_LIMIT for today."""
+    if not _quota_allows(units):
+        print(
+            f"Quota budget exceeded: {units} more units would bring today's usage to "
+            f"{_quota_spent + _quota_used + units} of YT_QUOTA_LIMIT={_quota_limit} "
+            "(resets at midnight Pacific Time).",
+            file=sys.stderr,
+        )
+        sys.exit(1)
 
-            print("Opening browser for YouTube authorisation...", file=sys.stderr)
-            flow = InstalledAppFlow.from_client_secrets_file(
-                str(CLIENT_SECRETS_FILE), SCOPES
-            )
-            creds = flow.run_local_server(port=0, open_browser=True)
-            print("Authorisation successful.", file=sys.stderr)
 
-        CREDENTIALS_DIR.mkdir(parents=True, exist_ok=True)
-        CREDENTIALS_FILE.write_text(creds.to_json())
+def _quota_cost(request):
+    return _QUOTA_COSTS.get(request.methodId, 1)
+
+
+def _charge(request):
+    """Record the quota cost of an API call before it is sent."""
+    global _quota_used
+    units = _quota_cost(request)
+    _check_quota(units)
+    _quota_used += units
+
+
+def _execute(request):
+    """Charge and execute a single API request, retrying transient failures.
+
+    googleapiclient's num_retries backs off exponentially with jitter on 5xx,
+    429 and rate-limit 403 responses, and on connection errors. It re-sends
+    regardless of HTTP method, so only idempotent requests are retried.
+    """
+    _charge(request)
+    retries = _MAX_RETRIES if request.method in _IDEMPOTENT_METHODS else 0
+    return request.execute(num_retries=retries)
+
+
+# ── ETag cache ─────────────────────────────────────────────────────────────────
+
+_cache_swept = False
+
+
+def _prune_cache(pattern, cutoff):
+    """Delete cache entries matching pattern last used before cutoff (a timestamp)."""
+    for path in CACHE_DIR.glob(pattern):
+        with contextlib.suppress(OSError):
+            if path.stat().st_mtime < cutoff:
+                path.unlink()
+
+
+def _write_cache(path, entry):
+    """Write a cache entry, first sweeping stale entries (once per process)."""
+    global _cache_swept
+    if not _cache_swept:
+        _cache_swept = True
+        now = time.time()
+        # TTL entries are useless once the longest TTL has passed
+        _prune_cache("ttl*.json", now - max(SEARCH_TTL, COMMENTS_TTL, PLAYLIST_ITEMS_TTL))
+        _prune_cache("etag.*.json", now - CACHE_MAX_AGE)
+    _atomic_write(path, json.dumps(entry))
+
+
+def _etag_path(request):
+    key = f"{request.method} {request.uri}"
+    return CACHE_DIR / f"etag.{request.methodId}.{hashlib.sha1(key.encode()).hexdigest()}.json"
+
+
+def _add_etag(request):
+    """Send If-None-Match for a previously cached response; return its body or None."""
+    if os.environ.get("YT_NO_CACHE"):
+        return None
+    path = _etag_path(request)
+    try:
+        entry = json.loads(path.read_text(encoding="utf-8"))
+        os.utime(path)  # mark as recently used so the age sweep keeps it
+    except (OSError, ValueError):
+        return None
+    request.headers["if-none-match"] = entry["etag"]
+    return entry["body"]
+
+
+def _store_etag(request, body):
+    if body.get("etag") and not os.environ.get("YT_NO_CACHE"):
+        _write_cache(_etag_path(request), {"etag": body["etag"], "body": body})
+
+
+def _is_not_modified(exc):
+    return getattr(getattr(exc, "resp", None), "status", None) == 304
+
+
+def _cached_execute(request):
+    """Execute a GET request, answering from the ETag cache on 304 Not Modified."""
+    cached = _add_etag(request)
+    try:
+        body = _execute(request)
+    except Exception as e:
+        if cached is not None and _is_not_modified(e):
+            return cached
+        raise
+    _store_etag(request, body)
+    return body
+
 
-    return build("youtube", "v3", credentials=creds)
+def _ttl_path(scope, params):
+    # "." never appears in API IDs, so a scope's entries glob as ttl.<scope>.*.json
+    digest = hashlib.sha1(json.dumps(params, sort_keys=True).encode()).hexdigest()
+    return CACHE_DIR / f"ttl.{scope}.{digest}.json"
+
+
+def _cached_list(scope, params, ttl, fetch, fresh=False):
+    """Return fetch() through a TTL'd on-disk cache keyed by scope and request parameters.
+
+    scope names what the listing depends on (e.g. "playlistItems.<playlist ID>")
+    so write commands can drop it with _invalidate(). fresh=True refetches and
+    rewrites the entry; YT_NO_CACHE=1 skips the cache entirely.
+    """
+    if os.environ.get("YT_NO_CACHE"):
+        return fetch()
+    path = _ttl_path(scope, params)
+    if not fresh:
+        try:
+            entry = json.loads(path.read_text(encoding="utf-8"))
+            if time.time() - entry["cached_at"] < ttl:
+                return entry["items"]
+        except (OSError, ValueError, KeyError):
+            pass
+    items = fetch()
+    _write_cache(path, {"cached_at": int(time.time()), "items": items})
+    return items
+
+
+def _invalidate(scope):
+    """Drop cached listings for scope after a write changed them."""
+    for path in CACHE_DIR.glob(f"ttl.{scope}.*.json"):
+        path.unlink(missing_ok=True)
+
+
+# ── Channel helpers ────────────────────────────────────────────────────────────
 
 
 def _my_channel(youtube):
-    resp = youtube.channels().list(part="id,snippet,contentDetails,statistics", mine=True).execute()
+    resp = _cached_execute(
+        youtube.channels().list(part="id,snippet,contentDetails,statistics", mine=True)
+    )
     items = resp.get("items", [])
     if not items:
         print("No YouTube channel found for this account.", file=sys.stderr)
@@ -118,41 +480,231 @@ def _my_channel(youtube):
     return items[0]
 
 
+def _save_channel_info(ch):
+    info = {
+        "channel_id": ch["id"],
+        "uploads_playlist_id": ch["contentDetails"]["relatedPlaylists"]["uploads"],
+        "cached_at": int(time.time()),
+    }
+    _atomic_write(CHANNEL_INFO_FILE, json.dumps(info))
+    return info
+
+
+def _channel_info(youtube):
+    """Return the cached channel_id / uploads_playlist_id, refreshing when stale."""
+    try:
+        info = json.loads(CHANNEL_INFO_FILE.read_text(encoding="utf-8"))
+        if time.time() - info["cached_at"] < CHANNEL_INFO_TTL:
+            return info
+    except (OSError, ValueError, KeyError):
+        pass
+    return _save_channel_info(_my_channel(youtube))
+
+
 def _my_channel_id(youtube):
-    return _my_channel(youtube)["id"]
+    return _channel_info(youtube)["channel_id"]
 
 
-def _uploads_playlist_id(youtube, channel_id=None):
-    cid = channel_id or _my_channel_id(youtube)
-    resp = youtube.channels().list(part="contentDetails", id=cid).execute()
-    return resp["items"][0]["contentDetails"]["relatedPlaylists"]["uploads"]
+def _uploads_playlist_id(youtube):
+    return _channel_info(youtube)["uploads_playlist_id"]
+
+
+def _forget_channel_info(uri):
+    """Drop the cached channel info if a failed request used one of its IDs."""
+    try:
+        info = json.loads(CHANNEL_INFO_FILE.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return
+    if uri and any(info.get(k) and info[k] in uri for k in ("channel_id", "uploads_playlist_id")):
+        CHANNEL_INFO_FILE.unlink(missing_ok=True)
 
 
 def _paginate(method, params, *, key="items", limit=None):
-    """Yield all items across paginated API responses, up to limit."""
-    collected = []
-    next_page = None
+    """Yield items across paginated API responses, stopping as soon as limit is reached.
+
+    When a limit is given, maxResults is shrunk on each page so the last
+    request asks only for the items still needed.
+    """
+    params = dict(params)
+    yielded = 0
     while True:
-        if next_page:
-            params = {**params, "pageToken": next_page}
-        resp = method(**params).execute()
-        batch = resp.get(key, [])
-        collected.extend(batch)
+        if limit is not None:
+            remaining = limit - yielded
+            if remaining <= 0:
+                return
+            params["maxResults"] = min(50, remaining)
+        resp = _execute(method(**params))
+        items = resp.get(key, [])
+        if limit is not None:
+            items = items[:remaining]
+        yield from items
+        yielded += len(items)
         next_page = resp.get("nextPageToken")
-        if not next_page or (limit is not None and len(collected) >= limit):
+        if not next_page:
+            return
+        params["pageToken"] = next_page
+
+
+def _error_reasons(exc):
+    details = getattr(exc, "error_details", None)
+    return {d.get("reason") for d in details if isinstance(d, dict)} if isinstance(details, list) else set()
+
+
+def _api_error_message(exc):
+    """Return the API's error message, as already parsed by HttpError."""
+    return getattr(exc, "reason", None) or str(exc)
+
+
+def _is_transient(exc):
+    status = getattr(getattr(exc, "resp", None), "status", None)
+    if status == 403:
+        return bool(_error_reasons(exc) & _RATE_LIMIT_REASONS)
+    return status in _TRANSIENT_STATUSES
+
+
+def _run_batch(youtube, requests, callback, use_etags=False, on_error=None):
+    """Execute (request_id, request) pairs as batch HTTP requests.
+
+    Sends up to _BATCH_SIZE calls per HTTP round trip instead of one each.
+    The callback receives (request_id, response) for every call. Calls that
+    fail transiently (rate limits, 5xx) are re-sent with exponential backoff,
+    as are all of a batch's calls if the batch request itself fails that way;
+    any other failure goes to on_error(request_id, exception) if given, else
+    is re-raised once its batch has been executed. With use_etags, GETs are
+    made conditional and 304s are served from the cache. When on_error is
+    given, calls that would pass YT_QUOTA_LIMIT (e.g. retries) are reported
+    to it instead of exiting.
+    """
+    errors = []
+    transient = []
+    by_id = dict(requests)
+    cached = {rid: _add_etag(req) for rid, req in requests} if use_etags else {}
+
+    def on_done(request_id, response, exception):
+        if exception is not None:
+            if cached.get(request_id) is not None and _is_not_modified(exception):
+                callback(request_id, cached[request_id])
+            elif _is_transient(exception):
+                transient.append((request_id, exception))
+            elif on_error is not None:
+                on_error(request_id, exception)
+            else:
+                errors.append(exception)
+        else:
+            if use_etags:
+                _store_etag(by_id[request_id], response)
+            callback(request_id, response)
+
+    for i in range(0, len(requests), _BATCH_SIZE):
+        pending = [rid for rid, _ in requests[i : i + _BATCH_SIZE]]
+        for attempt in range(_MAX_RETRIES + 1):
+            batch = youtube.new_batch_http_request(callback=on_done)
+            sent = []
+            for request_id in pending:
+                request = by_id[request_id]
+                if on_error is not None and not _quota_allows(_quota_cost(request)):
+                    # Retries are not covered by callers' up-front quota checks;
+                    # report the call as failed rather than exiting partway through
+                    on_error(request_id, RuntimeError(f"not sent: YT_QUOTA_LIMIT={_quota_limit} reached"))
+                    continue
+                _charge(request)
+                batch.add(request, request_id=request_id)
+                sent.append(request_id)
+            try:
+                batch.execute()
+            except Exception as e:
+                if not _is_transient(e):
+                    raise
+                transient.extend((rid, e) for rid in sent)
+            if errors:
+                raise errors[0]
+            if not transient:
+                break
+            if attempt == _MAX_RETRIES:
+                if on_error is None:
+                    raise transient[0][1]
+                for request_id, exception in transient:
+                    on_error(request_id, exception)
+                transient.clear()
+                break
+            pending = [rid for rid, _ in transient]
+            transient.clear()
+            delay = 2 ** attempt + random.random()
+            print(f"  Transient API errors; retrying {len(pending)} calls in {delay:.1f}s...", file=sys.stderr)
+            time.sleep(delay)
+
+
+def _fetch_video_details(
+    youtube, video_ids, part="snippet,status,statistics,contentDetails", fields=None, use_etags=False
+):
+    """Yield (video_id, item) pairs in input order; item is None for missing videos.
+
+    IDs are fetched 50 per call and one batch (one HTTP round trip) at a time.
+    video_ids may be any iterable and is consumed lazily, so only a single
+    batch of IDs and responses is held in memory.
+    """
+    videos = youtube.videos()
+    extra = {"fields": fields} if fields else {}
+    video_ids = iter(video_ids)
+    while True:
+        group = list(itertools.islice(video_ids, 50 * _BATCH_SIZE))
+        if not group:
+            return
+        details = {}
+        requests = [
+            (str(i), videos.list(part=part, id=",".join(group[i : i + 50]), **extra))
+            for i in range(0, len(group), 50)
+        ]
+        _run_batch(
+            youtube,
+            requests,
+            lambda _, resp: details.update((item["id"], item) for item in resp.get("items", [])),
+            use_etags=use_etags,
+        )
+        for vid_id in group:
+            yield vid_id, details.get(vid_id)
+
+
+def _filter_by_status(youtube, video_ids, status, limit):
+    """Return up to limit IDs with the given privacy status.
+
+    Statuses are checked with a status-only call per 50 IDs, pulling more
+    IDs from the iterable until limit matches are found, so full details
+    are only fetched for videos that will be shown.
+    """
+    video_ids = iter(video_ids)
+    matched = []
+    while len(matched) < limit:
+        chunk = list(itertools.islice(video_ids, 50))
+        if not chunk:
             break
-    return collected[:limit] if limit else collected
+        for vid_id, item in _fetch_video_details(youtube, chunk, part="status", fields=FIELDS_STATUS):
+            if item and item["status"]["privacyStatus"] == status:
+                matched.append(vid_id)
+    return matched[:limit]
+
+
+def _write_csv(rows, fieldnames):
+    """Write rows to stdout as CSV one at a time."""
+    writer = csv.DictWriter(sys.stdout, fieldnames=fieldnames)
+    writer.writeheader()
+    for row in rows:
+        writer.writerow(row)
 
 
-def _fetch_video_details(youtube, video_ids, part="snippet,status,statistics,contentDetails"):
-    """Batch-fetch video details for up to 50 IDs at a time."""
-    details = {}
-    for i in range(0, len(video_ids), 50):
-        batch = video_ids[i : i + 50]
-        resp = youtube.videos().list(part=part, id=",".join(batch)).execute()
-        for item in resp.get("items", []):
-            details[item["id"]] = item
-    return details
+def _write_json(rows):
+    """Stream rows to stdout as an indented JSON array, matching json.dumps(indent=2)."""
+    sep = "[\n  "
+    for row in rows:
+        sys.stdout.write(sep + json.dumps(row, indent=2).replace("\n", "\n  "))
+        sep = ",\n  "
+    sys.stdout.write("[]\n" if sep.startswith("[") else "\n]\n")
+
+
+def _write_jsonl(rows):
+    """Write rows to stdout as JSON Lines, one compact object per line."""
+    for row in rows:
+        sys.stdout.write(json.dumps(row) + "\n")
 
 
 # ── whoami ─────────────────────────────────────────────────────────────────────
@@ -189,65 +741,71 @@ def cmd_videos_list(args, youtube):
 
     items = _paginate(
         youtube.playlistItems().list,
-        dict(part="snippet,contentDetails", playlistId=uploads_id, maxResults=min(50, limit)),
-        limit=limit,
+        dict(part="contentDetails", playlistId=uploads_id, maxResults=50, fields=FIELDS_UPLOADS),
+        limit=None if args.status else limit,
     )
-
-    video_ids = [v["contentDetails"]["videoId"] for v in items]
-    details = _fetch_video_details(youtube, video_ids, part="snippet,status,statistics")
+    uploads = (v["contentDetails"]["videoId"] for v in items)
 
     if args.status:
-        video_ids = [
-            vid for vid in video_ids
-            if details.get(vid, {}).get("status", {}).get("privacyStatus") == args.status
-        ]
+        video_ids = _filter_by_status(youtube, uploads, args.status, limit)
+    else:
+        video_ids = list(uploads)
+    details = _fetch_video_details(
+        youtube, video_ids, part="snippet,status,statistics", fields=FIELDS_VIDEO_LIST
+    )
 
-    rows = []
-    for vid_id in video_ids:
-        d = details.get(vid_id, {})
-        s = d.get("snippet", {})
-        st = d.get("status", {})
-        stats = d.get("statistics", {})
-        rows.append({
-            "id": vid_id,
-            "title": s.get("title", "(deleted)"),
-            "published": (s.get("publishedAt") or "")[:10],
-            "status": st.get("privacyStatus", "?"),
-            "views": stats.get("viewCount", "?"),
-            "likes": stats.get("likeCount", "?"),
-            "comments": stats.get("commentCount", "?"),
-            "url": f"https://youtu.be/{vid_id}",
-        })
+    def build_rows():
+        for vid_id, d in details:
+            d = d or _EMPTY
+            s, st, stats = d.get("snippet", _EMPTY), d.get("status", _EMPTY), d.get("statistics", _EMPTY)
+            yield {
+                "id": vid_id,
+                "title": s.get("title", "(deleted)"),
+                "published": (s.get("publishedAt") or "")[:10],
+                "status": st.get("privacyStatus", "?"),
+                "views": stats.get("viewCount", "?"),
+                "likes": stats.get("likeCount", "?"),
+                "comments": stats.get("commentCount", "?"),
+                "url": f"https://youtu.be/{vid_id}",
+            }
 
+    rows = build_rows()
     fmt = getattr(args, "format", "table")
     if fmt == "json":
-        print(json.dumps(rows, indent=2))
+        _write_json(rows)
     elif fmt == "csv":
-        if rows:
-            writer = csv.DictWriter(sys.stdout, fieldnames=list(rows[0].keys()))
-            writer.writeheader()
-            writer.writerows(rows)
+        _write_csv(rows, VIDEO_LIST_FIELDNAMES)
     else:
-        for r in rows:
-            title = r["title"][:52]
-            views = str(r["views"]).rjust(9)
-            print(f"{r['id']}  {r['status']:9}  {views} views  {r['published']}  {title}")
+        sys.stdout.write("".join(
+            VIDEO_ROW_FMT(
+                id=r["id"], status=r["status"], views=r["views"],
+                published=r["published"], title=r["title"][:52],
+            )
+            for r in rows
+        ))
 
 
 # ── videos get ─────────────────────────────────────────────────────────────────
 
 def cmd_videos_get(args, youtube):
-    resp = youtube.videos().list(
-        part="snippet,status,statistics,contentDetails,localizations",
-        id=args.video_id,
-    ).execute()
-    items = resp.get("items", [])
+    fmt = getattr(args, "format", "table")
+    if fmt == "json":
+        request = youtube.videos().list(
+            part="snippet,status,statistics,contentDetails,localizations",
+            id=args.video_id,
+        )
+    else:
+        request = youtube.videos().list(
+            part="snippet,status,statistics,contentDetails",
+            id=args.video_id,
+            fields=FIELDS_VIDEO_DETAIL,
+        )
+    items = _execute(request).get("items", [])
     if not items:
         print(f"Video not found: {args.video_id}", file=sys.stderr)
         sys.exit(1)
 
     item = items[0]
-    fmt = getattr(args, "format", "table")
     if fmt == "json":
         print(json.dumps(item, indent=2))
         return
@@ -277,6 +835,11 @@ def cmd_videos_get(args, youtube):
 
 # ── videos upload ──────────────────────────────────────────────────────────────
 
+def _split_tags(text, sep=","):
+    """Split a tag list, trimming whitespace and dropping empty entries."""
+    return [t for t in map(str.strip, text.split(sep)) if t]
+
+
 def cmd_videos_upload(args, youtube):
     from googleapiclient.http import MediaFileUpload
 
@@ -286,7 +849,7 @@ def cmd_videos_upload(args, youtube):
         sys.exit(1)
 
     title = args.title or file_path.stem
-    tags = [t.strip() for t in args.tags.split(",")] if args.tags else []
+    tags = _split_tags(args.tags) if args.tags else []
 
     body = {
         "snippet": {
@@ -305,36 +868,40 @@ def cmd_videos_upload(args, youtube):
         body["status"]["publishAt"] = args.schedule
         body["status"]["privacyStatus"] = "private"
 
-    # Detect MIME type
-    ext = file_path.suffix.lower()
-    mime_map = {
-        ".mp4": "video/mp4",
-        ".mov": "video/quicktime",
-        ".avi": "video/x-msvideo",
-        ".mkv": "video/x-matroska",
-        ".webm": "video/webm",
-        ".flv": "video/x-flv",
-        ".wmv": "video/x-ms-wmv",
-        ".m4v": "video/x-m4v",
-    }
-    mime_type = mime_map.get(ext, "video/*")
-
-    media = MediaFileUpload(str(file_path), mimetype=mime_type, chunksize=256 * 1024, resumable=True)
-    request = youtube.videos().insert(part="snippet,status", body=body, media_body=media)
+    mime_type = (
+        _VIDEO_MIME.get(file_path.suffix.lower())
+        or mimetypes.guess_type(file_path.name)[0]
+        or "video/*"
+    )
 
-    print(f"Uploading: {file_path.name}  ({file_path.stat().st_size // (1024*1024)} MB)")
-    response = None
-    while response is None:
-        status, response = request.next_chunk()
-        if status:
-            pct = int(status.progress() * 100)
-            print(f"\r  Progress: {pct:3}%", end="", flush=True)
-    print()
+    size = file_path.stat().st_size
+    print(f"Uploading: {file_path.name}  ({size // (1024*1024)} MB)")
+    if size < _SIMPLE_UPLOAD_MAX:
+        # Small files go up in one request; a resumable session would only add round trips
+        media = MediaFileUpload(str(file_path), mimetype=mime_type, resumable=False)
+        response = _execute(youtube.videos().insert(part="snippet,status", body=body, media_body=media))
+    else:
+        # Large chunks (a multiple of 256 KB, as the API requires) keep the request count low
+        chunksize = max(_MIN_UPLOAD_CHUNK, size // 128)
+        chunksize = -(-chunksize // _UPLOAD_CHUNK_UNIT) * _UPLOAD_CHUNK_UNIT
+        media = MediaFileUpload(str(file_path), mimetype=mime_type, chunksize=chunksize, resumable=True)
+        request = youtube.videos().insert(part="snippet,status", body=body, media_body=media)
+        _charge(request)
+        response = None
+        while response is None:
+            status, response = request.next_chunk(num_retries=_MAX_RETRIES)
+            if status:
+                pct = int(status.progress() * 100)
+                print(f"\r  Progress: {pct:3}%", end="", flush=True)
+        print()
 
     video_id = response["id"]
     privacy = body["status"]["privacyStatus"]
     scheduled = body["status"].get("publishAt")
 
+    # The new video joins the uploads playlist
+    _invalidate("playlistItems.*")
+
     print("Upload complete!")
     print(f"  Video ID: {video_id}")
     print(f"  URL:      https://youtu.be/{video_id}")
@@ -348,46 +915,68 @@ def cmd_videos_upload(args, youtube):
 
 # ── videos update ─────────────────────────────────────────────────────────────
 
-def cmd_videos_update(args, youtube):
-    resp = youtube.videos().list(part="snippet,status", id=args.video_id).execute()
-    if not resp.get("items"):
-        print(f"Video not found: {args.video_id}", file=sys.stderr)
-        sys.exit(1)
+_STATUS_KEYS = ("privacyStatus", "publishAt")
 
-    item = resp["items"][0]
-    snippet = item["snippet"]
-    status = item["status"]
 
+def _diff_and_apply(snippet, status, changes):
+    """Apply changes (keyed by API field name) in place; return True if any value differed.
+
+    Lets callers skip videos.update calls (50 quota units each) that would
+    not change anything.
+    """
     changed = False
+    for key, value in changes.items():
+        target = status if key in _STATUS_KEYS else snippet
+        current = target.get(key)
+        if key == "tags":
+            current = current or []
+        if current != value:
+            target[key] = value
+            changed = True
+    return changed
 
+
+def cmd_videos_update(args, youtube):
+    changes = {}
     if args.title is not None:
-        snippet["title"] = args.title
-        changed = True
+        changes["title"] = args.title
     if args.description is not None:
-        snippet["description"] = args.description
-        changed = True
+        changes["description"] = args.description
     if args.tags is not None:
-        snippet["tags"] = [t.strip() for t in args.tags.split(",") if t.strip()]
-        changed = True
+        changes["tags"] = _split_tags(args.tags)
     if args.category is not None:
-        snippet["categoryId"] = args.category
-        changed = True
+        changes["categoryId"] = args.category
     if args.privacy is not None:
-        status["privacyStatus"] = args.privacy
-        changed = True
+        changes["privacyStatus"] = args.privacy
     if args.publish_at is not None:
-        status["publishAt"] = args.publish_at
-        status["privacyStatus"] = "private"
-        changed = True
+        changes["publishAt"] = args.publish_at
+        changes["privacyStatus"] = "private"
 
-    if not changed:
+    if not changes:
         print("Nothing to update. Provide at least one field to change.")
         sys.exit(1)
 
-    youtube.videos().update(
+    resp = _cached_execute(youtube.videos().list(part="snippet,status", id=args.video_id))
+    if not resp.get("items"):
+        print(f"Video not found: {args.video_id}", file=sys.stderr)
+        sys.exit(1)
+
+    item = resp["items"][0]
+    snippet = item["snippet"]
+    status = item["status"]
+
+    if not _diff_and_apply(snippet, status, changes):
+        print(f"No change: {args.video_id}")
+        return
+
+    _execute(youtube.videos().update(
         part="snippet,status",
         body={"id": args.video_id, "snippet": snippet, "status": status},
-    ).execute()
+    ))
+
+    # Titles show up in any playlist listing and in search results
+    _invalidate("playlistItems.*")
+    _invalidate("search")
 
     print(f"Updated: https://youtu.be/{args.video_id}")
     print(f"  Title:  {snippet['title']}")
@@ -396,13 +985,24 @@ def cmd_videos_update(args, youtube):
 
 # ── videos delete ─────────────────────────────────────────────────────────────
 
+def _confirm_delete(prompt):
+    """Ask a y/N question before deleting; without a terminal, refuse instead of reading piped input."""
+    # stdin is None when the process was started with it closed (cron, daemons)
+    if not (sys.stdin is not None and sys.stdin.isatty() and sys.stdout.isatty()):
+        print("Refusing to delete without --yes when not run from a terminal.", file=sys.stderr)
+        sys.exit(1)
+    return input(prompt).strip().lower() == "y"
+
+
 def cmd_videos_delete(args, youtube):
-    if not args.yes:
-        confirm = input(f"Permanently delete video {args.video_id}? This cannot be undone. [y/N] ")
-        if confirm.strip().lower() != "y":
-            print("Aborted.")
-            return
-    youtube.videos().delete(id=args.video_id).execute()
+    if not args.yes and not _confirm_delete(
+        f"Permanently delete video {args.video_id}? This cannot be undone. [y/N] "
+    ):
+        print("Aborted.")
+        return
+    _execute(youtube.videos().delete(id=args.video_id))
+    _invalidate("playlistItems.*")
+    _invalidate("search")
     print(f"Deleted: {args.video_id}")
 
 
@@ -416,41 +1016,47 @@ def cmd_videos_thumbnail(args, youtube):
         print(f"Image not found: {img_path}", file=sys.stderr)
         sys.exit(1)
 
-    ext = img_path.suffix.lower()
-    mime_map = {".jpg": "image/jpeg", ".jpeg": "image/jpeg", ".png": "image/png"}
-    mime = mime_map.get(ext, "image/jpeg")
+    mime = (
+        _IMAGE_MIME.get(img_path.suffix.lower())
+        or mimetypes.guess_type(img_path.name)[0]
+        or "image/jpeg"
+    )
 
-    size_mb = img_path.stat().st_size / (1024 * 1024)
-    if size_mb > 2:
-        print(f"Warning: thumbnail is {size_mb:.1f} MB. YouTube requires ≤ 2 MB.", file=sys.stderr)
+    size = img_path.stat().st_size
+    if size > 2 * 1024 * 1024:
+        print(f"Warning: thumbnail is {size / (1024 * 1024):.1f} MB. YouTube requires ≤ 2 MB.", file=sys.stderr)
 
     media = MediaFileUpload(str(img_path), mimetype=mime)
-    youtube.thumbnails().set(videoId=args.video_id, media_body=media).execute()
+    _execute(youtube.thumbnails().set(videoId=args.video_id, media_body=media))
     print(f"Thumbnail set for: {args.video_id}")
 
 
 # ── playlists list ─────────────────────────────────────────────────────────────
 
 def cmd_playlists_list(args, youtube):
-    items = _paginate(
-        youtube.playlists().list,
-        dict(part="snippet,contentDetails,status", mine=True, maxResults=50),
-    )
     fmt = getattr(args, "format", "table")
+    params = dict(part="snippet,contentDetails,status", mine=True, maxResults=50)
+    if fmt == "table":
+        params["fields"] = FIELDS_PLAYLISTS
+    items = _paginate(youtube.playlists().list, params)
     if fmt == "json":
-        print(json.dumps(items, indent=2))
+        _write_json(items)
         return
-    for pl in items:
-        count = pl["contentDetails"]["itemCount"]
-        status = pl["status"]["privacyStatus"]
-        title = pl["snippet"]["title"][:52]
-        print(f"{pl['id']}  {status:9}  {count:4} videos  {title}")
+    sys.stdout.write("".join(
+        PLAYLIST_ROW_FMT(
+            id=pl["id"],
+            status=pl["status"]["privacyStatus"],
+            count=pl["contentDetails"]["itemCount"],
+            title=pl["snippet"]["title"][:52],
+        )
+        for pl in items
+    ))
 
 
 # ── playlists create ───────────────────────────────────────────────────────────
 
 def cmd_playlists_create(args, youtube):
-    resp = youtube.playlists().insert(
+    resp = _execute(youtube.playlists().insert(
         part="snippet,status",
         body={
             "snippet": {
@@ -459,7 +1065,7 @@ def cmd_playlists_create(args, youtube):
             },
             "status": {"privacyStatus": args.privacy or "public"},
         },
-    ).execute()
+    ))
     print(f"Created: {resp['id']}")
     print(f"URL:     https://www.youtube.com/playlist?list={resp['id']}")
 
@@ -467,24 +1073,27 @@ def cmd_playlists_create(args, youtube):
 # ── playlists items ────────────────────────────────────────────────────────────
 
 def cmd_playlists_items(args, youtube):
-    items = _paginate(
-        youtube.playlistItems().list,
-        dict(part="snippet,contentDetails", playlistId=args.playlist_id, maxResults=50),
-    )
     fmt = getattr(args, "format", "table")
+    params = dict(part="snippet,contentDetails", playlistId=args.playlist_id, maxResults=50)
+    if fmt == "table":
+        params["fields"] = FIELDS_PLAYLIST_ITEMS
+    items = _cached_list(
+        f"playlistItems.{args.playlist_id}", params, PLAYLIST_ITEMS_TTL,
+        lambda: list(_paginate(youtube.playlistItems().list, params)), fresh=args.fresh,
+    )
     if fmt == "json":
-        print(json.dumps(items, indent=2))
+        _write_json(items)
         return
-    for i, item in enumerate(items, 1):
-        vid_id = item["contentDetails"]["videoId"]
-        title = item["snippet"]["title"][:55]
-        print(f"{i:4}.  {vid_id}  {title}")
+    sys.stdout.write("".join(
+        PLAYLIST_ITEM_ROW_FMT(n=i, id=item["contentDetails"]["videoId"], title=item["snippet"]["title"][:55])
+        for i, item in enumerate(items, 1)
+    ))
 
 
 # ── playlists add ─────────────────────────────────────────────────────────────
 
 def cmd_playlists_add(args, youtube):
-    youtube.playlistItems().insert(
+    _execute(youtube.playlistItems().insert(
         part="snippet",
         body={
             "snippet": {
@@ -492,71 +1101,79 @@ def cmd_playlists_add(args, youtube):
                 "resourceId": {"kind": "youtube#video", "videoId": args.video_id},
             }
         },
-    ).execute()
+    ))
+    _invalidate(f"playlistItems.{args.playlist_id}")
     print(f"Added {args.video_id} → {args.playlist_id}")
 
 
 # ── playlists remove ───────────────────────────────────────────────────────────
 
 def cmd_playlists_remove(args, youtube):
-    resp = youtube.playlistItems().list(
+    resp = _execute(youtube.playlistItems().list(
         part="id",
         playlistId=args.playlist_id,
         videoId=args.video_id,
-    ).execute()
+    ))
     items = resp.get("items", [])
     if not items:
         print(f"Video {args.video_id} not found in playlist {args.playlist_id}", file=sys.stderr)
         sys.exit(1)
-    youtube.playlistItems().delete(id=items[0]["id"]).execute()
+    _execute(youtube.playlistItems().delete(id=items[0]["id"]))
+    _invalidate(f"playlistItems.{args.playlist_id}")
     print(f"Removed {args.video_id} from {args.playlist_id}")
 
 
 # ── playlists delete ───────────────────────────────────────────────────────────
 
 def cmd_playlists_delete(args, youtube):
-    if not args.yes:
-        confirm = input(f"Delete playlist {args.playlist_id}? [y/N] ")
-        if confirm.strip().lower() != "y":
-            print("Aborted.")
-            return
-    youtube.playlists().delete(id=args.playlist_id).execute()
+    if not args.yes and not _confirm_delete(f"Delete playlist {args.playlist_id}? [y/N] "):
+        print("Aborted.")
+        return
+    _execute(youtube.playlists().delete(id=args.playlist_id))
+    _invalidate(f"playlistItems.{args.playlist_id}")
     print(f"Deleted playlist: {args.playlist_id}")
 
 
 # ── comments list ─────────────────────────────────────────────────────────────
 
 def cmd_comments_list(args, youtube):
-    resp = youtube.commentThreads().list(
+    fmt = getattr(args, "format", "table")
+    params = dict(
         part="snippet,replies",
         videoId=args.video_id,
         maxResults=min(args.limit or 20, 100),
         order=args.order or "relevance",
-    ).execute()
-
-    items = resp.get("items", [])
-    fmt = getattr(args, "format", "table")
+    )
+    if fmt == "table":
+        # The table shows reply counts only, so the replies part is not needed
+        params.update(part="snippet", fields=FIELDS_COMMENTS)
+    items = _cached_list(
+        f"commentThreads.{args.video_id}", params, COMMENTS_TTL,
+        lambda: _execute(youtube.commentThreads().list(**params)).get("items", []),
+        fresh=args.fresh,
+    )
     if fmt == "json":
-        print(json.dumps(items, indent=2))
+        _write_json(items)
         return
 
+    buf = []
     for item in items:
         top = item["snippet"]["topLevelComment"]["snippet"]
-        thread_id = item["id"]
-        author = top["authorDisplayName"]
-        text = top["textDisplay"].replace("\n", " ")[:120]
-        likes = top["likeCount"]
-        replies = item["snippet"]["totalReplyCount"]
-        published = top["publishedAt"][:10]
-        print(f"[{thread_id}]  {published}  {author}  ({likes} likes, {replies} replies)")
-        print(f"  {text}")
-        print()
+        buf.append(COMMENT_ROW_FMT(
+            id=item["id"],
+            published=top["publishedAt"][:10],
+            author=top["authorDisplayName"],
+            likes=top["likeCount"],
+            replies=item["snippet"]["totalReplyCount"],
+            text=top["textDisplay"].replace("\n", " ")[:120],
+        ))
+    sys.stdout.write("".join(buf))
 
 
 # ── comments reply ────────────────────────────────────────────────────────────
 
 def cmd_comments_reply(args, youtube):
-    youtube.comments().insert(
+    _execute(youtube.comments().insert(
         part="snippet",
         body={
             "snippet": {
@@ -564,88 +1181,95 @@ def cmd_comments_reply(args, youtube):
                 "textOriginal": args.text,
             }
         },
-    ).execute()
+    ))
+    # A reply only names its thread, not the video, so drop every cached thread list
+    _invalidate("commentThreads.*")
     print("Reply posted.")
 
 
 # ── search ────────────────────────────────────────────────────────────────────
 
 def cmd_search(args, youtube):
-    channel_id = _my_channel_id(youtube)
-    resp = youtube.search().list(
+    fmt = getattr(args, "format", "table")
+    params = dict(
         part="snippet",
-        channelId=channel_id,
+        channelId=_my_channel_id(youtube),
         q=args.query,
         type=args.type or "video",
         maxResults=min(args.limit or 10, 50),
         order="relevance",
-    ).execute()
-
-    items = resp.get("items", [])
-    fmt = getattr(args, "format", "table")
+    )
+    if fmt == "table":
+        params["fields"] = FIELDS_SEARCH
+    items = _cached_list(
+        "search", params, SEARCH_TTL,
+        lambda: _execute(youtube.search().list(**params)).get("items", []),
+        fresh=args.fresh,
+    )
     if fmt == "json":
-        print(json.dumps(items, indent=2))
+        _write_json(items)
         return
 
+    buf = []
     for item in items:
         kind = item["id"].get("kind", "")
         if "video" in kind:
             rid = item["id"].get("videoId", "?")
-            url = f"https://youtu.be/{rid}"
         elif "playlist" in kind:
             rid = item["id"].get("playlistId", "?")
-            url = f"https://youtube.com/playlist?list={rid}"
         else:
             rid = item["id"].get("channelId", "?")
-            url = f"https://youtube.com/channel/{rid}"
-        title = item["snippet"]["title"][:55]
-        published = item["snippet"]["publishedAt"][:10]
-        print(f"{rid}  {published}  {title}")
-        _ = url  # available in JSON output
+        buf.append(SEARCH_ROW_FMT(
+            id=rid, published=item["snippet"]["publishedAt"][:10], title=item["snippet"]["title"][:55]
+        ))
+    sys.stdout.write("".join(buf))
 
 
 # ── export ────────────────────────────────────────────────────────────────────
 
 def cmd_export(args, youtube):
-    """Export every channel video to CSV or JSON (stdout)."""
+    """Export every channel video to CSV, JSON or JSON Lines (stdout)."""
+    started = time.time()
     uploads_id = _uploads_playlist_id(youtube)
 
     items = _paginate(
         youtube.playlistItems().list,
-        dict(part="contentDetails", playlistId=uploads_id, maxResults=50),
+        dict(part="contentDetails", playlistId=uploads_id, maxResults=50, fields=FIELDS_UPLOADS),
     )
-    video_ids = [v["contentDetails"]["videoId"] for v in items]
-    details = _fetch_video_details(youtube, video_ids)
-
-    rows = []
-    for vid_id in video_ids:
-        d = details.get(vid_id)
-        if not d:
-            continue
-        s = d["snippet"]
-        rows.append({
-            "id": vid_id,
-            "title": s.get("title", ""),
-            "description": s.get("description", ""),
-            "tags": "|".join(s.get("tags", [])),
-            "category_id": s.get("categoryId", ""),
-            "published_at": s.get("publishedAt", ""),
-            "status": d["status"].get("privacyStatus", ""),
-            "duration": d.get("contentDetails", {}).get("duration", ""),
-            "views": d.get("statistics", {}).get("viewCount", ""),
-            "likes": d.get("statistics", {}).get("likeCount", ""),
-            "comments": d.get("statistics", {}).get("commentCount", ""),
-            "url": f"https://youtu.be/{vid_id}",
-        })
+    video_ids = (v["contentDetails"]["videoId"] for v in items)
+    details = _fetch_video_details(youtube, video_ids, fields=FIELDS_EXPORT, use_etags=True)
+
+    def build_rows():
+        for vid_id, d in details:
+            if not d:
+                continue
+            s, st, stats = d["snippet"], d["status"], d.get("statistics", _EMPTY)
+            yield {
+                "id": vid_id,
+                "title": s.get("title", ""),
+                "description": s.get("description", ""),
+                "tags": "|".join(s.get("tags", ())),
+                "category_id": s.get("categoryId", ""),
+                "published_at": s.get("publishedAt", ""),
+                "status": st.get("privacyStatus", ""),
+                "duration": d.get("contentDetails", _EMPTY).get("duration", ""),
+                "views": stats.get("viewCount", ""),
+                "likes": stats.get("likeCount", ""),
+                "comments": stats.get("commentCount", ""),
+                "url": f"https://youtu.be/{vid_id}",
+            }
 
     fmt = getattr(args, "format", "csv")
     if fmt == "json":
-        print(json.dumps(rows, indent=2))
+        _write_json(build_rows())
+    elif fmt == "jsonl":
+        _write_jsonl(build_rows())
     else:
-        if rows:
-            writer = csv.DictWriter(sys.stdout, fieldnames=list(rows[0].keys()))
-            writer.writeheader()
-            writer.writerows(rows)
+        _write_csv(build_rows(), EXPORT_FIELDNAMES)
+
+    # Detail chunks are keyed by 50-ID windows of the newest-first uploads list,
+    # so a new upload shifts every window; drop the entries this run did not use
+    _prune_cache("etag.youtube.videos.list.*.json", started)
 
 
 # ── bulk-update ───────────────────────────────────────────────────────────────
@@ -662,27 +1286,51 @@ def cmd_bulk_update(args, youtube):
         print(f"File not found: {csv_path}", file=sys.stderr)
         sys.exit(1)
 
-    with open(csv_path, newline="", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        rows = list(reader)
+    # csv.reader plus a column-index map avoids building a dict per row;
+    # utf-8-sig drops the byte-order mark Excel writes before the header
+    with open(csv_path, newline="", encoding="utf-8-sig") as f:
+        reader = csv.reader(f, dialect="excel")
+        header = next(reader, [])
+        records = [rec for rec in reader if rec]  # skip blank lines, as DictReader does
 
-    if not rows:
+    if not records:
         print("CSV is empty.")
         return
 
-    if "id" not in rows[0]:
+    col = {name: i for i, name in enumerate(header)}
+    if "id" not in col:
         print("CSV must have an 'id' column.", file=sys.stderr)
         sys.exit(1)
 
-    ids = [r["id"].strip() for r in rows if r.get("id", "").strip()]
+    width = len(header)
+    for rec in records:
+        if len(rec) < width:
+            rec.extend([""] * (width - len(rec)))
+    id_i = col["id"]
+    title_i = col.get("title")
+    description_i = col.get("description")
+    tags_i = col.get("tags")
+    category_i = col.get("category_id")
+    status_i = col.get("status")
+
+    ids = [rec[id_i].strip() for rec in records if rec[id_i].strip()]
     print(f"Fetching current metadata for {len(ids)} videos...")
 
-    current = _fetch_video_details(youtube, ids, part="snippet,status")
+    current = {
+        vid_id: item
+        for vid_id, item in _fetch_video_details(youtube, ids, part="snippet,status", use_etags=True)
+        if item
+    }
 
+    videos = youtube.videos()
     updated = 0
     skipped = 0
-    for row in rows:
-        vid_id = row.get("id", "").strip()
+    failed = []
+    quota_failed = []
+    requests = []
+    request_video_ids = []
+    for rec in records:
+        vid_id = rec[id_i].strip()
         if not vid_id or vid_id not in current:
             print(f"  Skip (not found): {vid_id}")
             skipped += 1
@@ -691,61 +1339,98 @@ def cmd_bulk_update(args, youtube):
         item = current[vid_id]
         snippet = item["snippet"]
         status = item["status"]
-        changed = False
-
-        if row.get("title", "").strip():
-            snippet["title"] = row["title"].strip()
-            changed = True
-        if "description" in row:
-            snippet["description"] = row["description"]
-            changed = True
-        if row.get("tags", "").strip():
-            snippet["tags"] = [t.strip() for t in row["tags"].split("|") if t.strip()]
-            changed = True
-        if row.get("category_id", "").strip():
-            snippet["categoryId"] = row["category_id"].strip()
-            changed = True
-        if row.get("status", "").strip():
-            status["privacyStatus"] = row["status"].strip()
-            changed = True
-
-        if not changed:
+        changes = {}
+        if title_i is not None and rec[title_i].strip():
+            changes["title"] = rec[title_i].strip()
+        if description_i is not None:
+            changes["description"] = rec[description_i]
+        if tags_i is not None and rec[tags_i].strip():
+            changes["tags"] = _split_tags(rec[tags_i], "|")
+        if category_i is not None and rec[category_i].strip():
+            changes["categoryId"] = rec[category_i].strip()
+        if status_i is not None and rec[status_i].strip():
+            changes["privacyStatus"] = rec[status_i].strip()
+
+        if not _diff_and_apply(snippet, status, changes):
+            print(f"  No change: {vid_id}")
             skipped += 1
             continue
 
-        youtube.videos().update(
+        request = videos.update(
             part="snippet,status",
             body={"id": vid_id, "snippet": snippet, "status": status},
-        ).execute()
+        )
+        requests.append((str(len(requests)), request))
+        request_video_ids.append(vid_id)
 
-        print(f"  Updated: {vid_id}  {snippet['title'][:55]}")
+    def on_updated(_, resp):
+        nonlocal updated
+        print(f"  Updated: {resp['id']}  {resp['snippet']['title'][:55]}")
         updated += 1
-        time.sleep(0.15)  # stay well within quota
 
-    print(f"\nDone. Updated {updated} videos, skipped {skipped}.")
+    def on_failed(request_id, exc):
+        vid_id = request_video_ids[int(request_id)]
+        if "quotaExceeded" in _error_reasons(exc):
+            # Every remaining update fails the same way; report it once
+            if not quota_failed:
+                print(f"  Failed: {vid_id}  {_api_error_message(exc)}")
+            quota_failed.append(vid_id)
+            return
+        print(f"  Failed: {vid_id}")
+        failed.append((vid_id, _api_error_message(exc)))
+
+    # Refuse up front rather than stopping partway through the CSV
+    _check_quota(len(requests) * _QUOTA_COSTS["youtube.videos.update"])
+    _run_batch(youtube, requests, on_updated, on_error=on_failed)
+
+    if updated:
+        _invalidate("playlistItems.*")
+        _invalidate("search")
+
+    print(f"\nDone. Updated {updated} videos, skipped {skipped}, failed {len(failed) + len(quota_failed)}.")
+    if failed or quota_failed:
+        print("\nFailures:")
+        for vid_id, msg in failed:
+            print(f"  {vid_id}  {msg}")
+        if quota_failed:
+            print(f"  {len(quota_failed)} videos not updated: daily quota exceeded "
+                  "(resets at midnight Pacific Time)")
+        sys.exit(1)
+
+
+# ── cache clear ───────────────────────────────────────────────────────────────
+
+@_no_service
+def cmd_cache_clear(args, youtube):
+    removed = len(list(CACHE_DIR.glob("*.json"))) if CACHE_DIR.exists() else 0
+    shutil.rmtree(CACHE_DIR, ignore_errors=True)
+    with contextlib.suppress(FileNotFoundError):
+        CHANNEL_INFO_FILE.unlink()
+    print(f"Cleared {removed} cached responses.")
 
 
 # ── Argument parser ────────────────────────────────────────────────────────────
 
-def build_parser():
-    parser = argparse.ArgumentParser(
-        prog="yt.py",
-        description="YouTube Creator CLI — manage your channel with the YouTube Data API v3",
-        formatter_class=argparse.RawDescriptionHelpFormatter,
-    )
+# Shared choices; tuples keep the order argparse shows in --help and errors
+_PRIVACY = ("public", "private", "unlisted")
+_FMT = ("table", "json")
+_VIDEO_LIST_FMT = ("table", "csv", "json")
+_EXPORT_FMT = ("csv", "json", "jsonl")
+_ORDER = ("relevance", "time")
+_TYPE = ("video", "playlist", "channel")
 
-    sub = parser.add_subparsers(dest="command", metavar="COMMAND")
-    sub.required = True
 
-    # auth
+def _build_auth(sub):
     p = sub.add_parser("auth", help="Set up or refresh OAuth2 credentials")
     p.set_defaults(func=cmd_auth)
 
-    # whoami
+
+def _build_whoami(sub):
     p = sub.add_parser("whoami", help="Show authenticated channel info")
     p.set_defaults(func=cmd_whoami)
 
-    # ── videos ────────────────────────────────────────────────────────────────
+
+def _build_videos(sub):
     p_vid = sub.add_parser("videos", help="Video operations")
     vs = p_vid.add_subparsers(dest="subcommand", metavar="SUBCOMMAND")
     vs.required = True
@@ -753,14 +1438,14 @@ def build_parser():
     # videos list
     p = vs.add_parser("list", help="List channel videos")
     p.add_argument("--limit", "-n", type=int, default=50, metavar="N", help="Max results (default 50)")
-    p.add_argument("--status", choices=["public", "private", "unlisted"], help="Filter by privacy status")
-    p.add_argument("--format", choices=["table", "csv", "json"], default="table")
+    p.add_argument("--status", choices=_PRIVACY, help="Filter by privacy status")
+    p.add_argument("--format", choices=_VIDEO_LIST_FMT, default="table")
     p.set_defaults(func=cmd_videos_list)
 
     # videos get
     p = vs.add_parser("get", help="Get full details for a video")
     p.add_argument("video_id", help="YouTube video ID (e.g. dQw4w9WgXcQ)")
-    p.add_argument("--format", choices=["table", "json"], default="table")
+    p.add_argument("--format", choices=_FMT, default="table")
     p.set_defaults(func=cmd_videos_get)
 
     # videos upload
@@ -770,7 +1455,7 @@ def build_parser():
     p.add_argument("--description", "-d", default="", help="Video description")
     p.add_argument("--tags", help="Comma-separated tags")
     p.add_argument("--category", default="22", metavar="ID", help="Category ID (default 22 = People & Blogs)")
-    p.add_argument("--privacy", choices=["public", "private", "unlisted"], default="private",
+    p.add_argument("--privacy", choices=_PRIVACY, default="private",
                    help="Privacy status (default: private)")
     p.add_argument("--schedule", metavar="ISO8601",
                    help="Schedule publish at this UTC datetime, e.g. 2025-12-31T18:00:00Z")
@@ -783,7 +1468,7 @@ def build_parser():
     p.add_argument("--description", "-d", help="New description (use '' to clear)")
     p.add_argument("--tags", help="Comma-separated tags (replaces all existing tags)")
     p.add_argument("--category", metavar="ID", help="Category ID")
-    p.add_argument("--privacy", choices=["public", "private", "unlisted"], help="Privacy status")
+    p.add_argument("--privacy", choices=_PRIVACY, help="Privacy status")
     p.add_argument("--publish-at", dest="publish_at", metavar="ISO8601",
                    help="Schedule publish datetime (UTC); sets status to private until then")
     p.set_defaults(func=cmd_videos_update)
@@ -800,27 +1485,29 @@ def build_parser():
     p.add_argument("image", help="Path to thumbnail image (JPG or PNG, max 2 MB, 1280×720 recommended)")
     p.set_defaults(func=cmd_videos_thumbnail)
 
-    # ── playlists ─────────────────────────────────────────────────────────────
+
+def _build_playlists(sub):
     p_pl = sub.add_parser("playlists", help="Playlist operations")
     ps = p_pl.add_subparsers(dest="subcommand", metavar="SUBCOMMAND")
     ps.required = True
 
     # playlists list
     p = ps.add_parser("list", help="List all channel playlists")
-    p.add_argument("--format", choices=["table", "json"], default="table")
+    p.add_argument("--format", choices=_FMT, default="table")
     p.set_defaults(func=cmd_playlists_list)
 
     # playlists create
     p = ps.add_parser("create", help="Create a new playlist")
     p.add_argument("title", help="Playlist title")
     p.add_argument("--description", "-d", default="", help="Playlist description")
-    p.add_argument("--privacy", choices=["public", "private", "unlisted"], default="public")
+    p.add_argument("--privacy", choices=_PRIVACY, default="public")
     p.set_defaults(func=cmd_playlists_create)
 
     # playlists items
     p = ps.add_parser("items", help="List videos in a playlist")
     p.add_argument("playlist_id", help="Playlist ID")
-    p.add_argument("--format", choices=["table", "json"], default="table")
+    p.add_argument("--format", choices=_FMT, default="table")
+    p.add_argument("--fresh", action="store_true", help="Bypass the local response cache")
     p.set_defaults(func=cmd_playlists_items)
 
     # playlists add
@@ -841,7 +1528,8 @@ def build_parser():
     p.add_argument("--yes", "-y", action="store_true", help="Skip confirmation prompt")
     p.set_defaults(func=cmd_playlists_delete)
 
-    # ── comments ──────────────────────────────────────────────────────────────
+
+def _build_comments(sub):
     p_cm = sub.add_parser("comments", help="Comment operations")
     cms = p_cm.add_subparsers(dest="subcommand", metavar="SUBCOMMAND")
     cms.required = True
@@ -850,8 +1538,9 @@ def build_parser():
     p = cms.add_parser("list", help="List top-level comments on a video")
     p.add_argument("video_id", help="Video ID")
     p.add_argument("--limit", "-n", type=int, default=20, metavar="N")
-    p.add_argument("--order", choices=["relevance", "time"], default="relevance")
-    p.add_argument("--format", choices=["table", "json"], default="table")
+    p.add_argument("--order", choices=_ORDER, default="relevance")
+    p.add_argument("--format", choices=_FMT, default="table")
+    p.add_argument("--fresh", action="store_true", help="Bypass the local response cache")
     p.set_defaults(func=cmd_comments_list)
 
     # comments reply
@@ -860,20 +1549,24 @@ def build_parser():
     p.add_argument("text", help="Reply text")
     p.set_defaults(func=cmd_comments_reply)
 
-    # ── search ────────────────────────────────────────────────────────────────
+
+def _build_search(sub):
     p = sub.add_parser("search", help="Search your channel content")
     p.add_argument("query", help="Search query")
     p.add_argument("--limit", "-n", type=int, default=10, metavar="N")
-    p.add_argument("--type", choices=["video", "playlist", "channel"], default="video")
-    p.add_argument("--format", choices=["table", "json"], default="table")
+    p.add_argument("--type", choices=_TYPE, default="video")
+    p.add_argument("--format", choices=_FMT, default="table")
+    p.add_argument("--fresh", action="store_true", help="Bypass the local response cache")
     p.set_defaults(func=cmd_search)
 
-    # ── export ────────────────────────────────────────────────────────────────
+
+def _build_export(sub):
     p = sub.add_parser("export", help="Export all channel videos to CSV or JSON (stdout)")
-    p.add_argument("--format", choices=["csv", "json"], default="csv")
+    p.add_argument("--format", choices=_EXPORT_FMT, default="csv")
     p.set_defaults(func=cmd_export)
 
-    # ── bulk-update ───────────────────────────────────────────────────────────
+
+def _build_bulk_update(sub):
     p = sub.add_parser("bulk-update", help="Bulk-update video metadata from a CSV file")
     p.add_argument(
         "csv_file",
@@ -881,31 +1574,88 @@ def build_parser():
     )
     p.set_defaults(func=cmd_bulk_update)
 
+
+def _build_cache(sub):
+    p_c = sub.add_parser("cache", help="Local response cache")
+    cs = p_c.add_subparsers(dest="subcommand", metavar="SUBCOMMAND")
+    cs.required = True
+
+    # cache clear
+    p = cs.add_parser("clear", help="Delete cached API responses")
+    p.set_defaults(func=cmd_cache_clear)
+
+
+# Top-level command -> builder for its argparse subtree
+_SUBCOMMANDS = {
+    "auth": _build_auth,
+    "whoami": _build_whoami,
+    "videos": _build_videos,
+    "playlists": _build_playlists,
+    "comments": _build_comments,
+    "search": _build_search,
+    "export": _build_export,
+    "bulk-update": _build_bulk_update,
+    "cache": _build_cache,
+}
+
+
+def build_parser(command=None):
+    """Return the CLI parser.
+
+    With a known top-level command only that command's subtree is built;
+    otherwise (help, typos) every command is registered. Parsers are built
+    once per process and shared, so in-process callers (tests, REPL
+    sessions) only pay for construction on first use.
+    """
+    return _build_parser(command if command in _SUBCOMMANDS else None)
+
+
+@functools.lru_cache(maxsize=None)
+def _build_parser(command):
+    parser = argparse.ArgumentParser(
+        prog="yt.py",
+        description="YouTube Creator CLI — manage your channel with the YouTube Data API v3",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+
+    sub = parser.add_subparsers(dest="command", metavar="COMMAND")
+    sub.required = True
+
+    if command is not None:
+        _SUBCOMMANDS[command](sub)
+    else:
+        for build in _SUBCOMMANDS.values():
+            build(sub)
+
     return parser
 
 
 def main():
-    parser = build_parser()
-    args = parser.parse_args()
+    argv = sys.argv[1:]
+    parser = build_parser(argv[0] if argv else None)
+    args = parser.parse_args(argv)
 
     try:
-        youtube = get_service()
+        youtube = None if getattr(args.func, "_no_service", False) else get_service()
         args.func(args, youtube)
     except KeyboardInterrupt:
         print("\nInterrupted.", file=sys.stderr)
         sys.exit(130)
+    except ModuleNotFoundError as e:
+        # Only packages setup.sh installs; anything else is a real bug
+        if (e.name or "").split(".")[0] not in _SETUP_PACKAGES:
+            raise
+        print(f"Missing dependencies ({e.name}). Run:  bash scripts/setup.sh", file=sys.stderr)
+        sys.exit(1)
     except Exception as e:
         # Surface API errors clearly
         try:
             from googleapiclient.errors import HttpError
             if isinstance(e, HttpError):
-                try:
-                    detail = json.loads(e.content.decode())
-                    msg = detail.get("error", {}).get("message", str(e))
-                    code = detail.get("error", {}).get("code", e.resp.status)
-                    print(f"YouTube API error {code}: {msg}", file=sys.stderr)
-                except Exception:
-                    print(f"YouTube API error: {e}", file=sys.stderr)
+                if e.status_code == 404:
+                    # The cached uploads playlist / channel ID may be stale
+                    _forget_channel_info(e.uri)
+                print(f"YouTube API error {e.status_code}: {_api_error_message(e)}", file=sys.stderr)
                 sys.exit(1)
         except ImportError:
             pass